@@ -2,14 +2,11 @@
 AetherCode - Flask Backend for Code Analysis and AI Chat
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import os
 import json
 import logging
-import tempfile
-import shutil
-from werkzeug.utils import secure_filename
 
 # Import services
 from services.code_analyzer import CodeAnalyzer
@@ -32,6 +29,14 @@ code_analyzer = CodeAnalyzer()
 ai_service = AIService()
 code_executor = CodeExecutor()
 
+def _read_upload(file) -> str:
+    """
+    Read an uploaded file straight from the request stream as text
+    
+    Newlines are normalized the same way reading the file in text mode would.
+    """
+    return file.read().decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
 # API routes
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -65,7 +70,7 @@ def execute_code():
         })
         
     except Exception as e:
-        app.logger.error(f"Error executing code: {str(e)}")
+        app.logger.error("Error executing code: %s", e)
         return jsonify({
             'success': False,
             'error': f"Server error: {str(e)}"
@@ -90,7 +95,7 @@ def analyze_code():
         language = data.get('language', 'javascript')
         filename = data.get('filename', None)
         
-        logger.info(f"Analyzing code in {language}")
+        logger.info("Analyzing code in %s", language)
         
         # Perform code analysis
         analysis_result = code_analyzer.analyze(code, language, filename)
@@ -98,7 +103,7 @@ def analyze_code():
         return jsonify(analysis_result), 200
         
     except Exception as e:
-        logger.error(f"Error analyzing code: {str(e)}")
+        logger.error("Error analyzing code: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/chat', methods=['POST'])
@@ -122,7 +127,7 @@ def chat():
         language = data.get('language', 'javascript')
         history = data.get('history', [])
         
-        logger.info(f"Processing chat message: {user_message[:50]}...")
+        logger.info("Processing chat message: %.50s...", user_message)
         
         # Get AI response
         ai_response = ai_service.get_response(
@@ -138,7 +143,48 @@ def chat():
         })
         
     except Exception as e:
-        logger.error(f"Error processing chat: {str(e)}")
+        logger.error("Error processing chat: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """
+    Stream the AI reply to a chat message as server-sent events
+    Expects the same JSON body as /api/chat. Each event carries
+    {"delta": "<text>"}; the stream ends with a [DONE] event.
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or 'message' not in data:
+            return jsonify({"success": False, "error": "No message provided"}), 400
+            
+        user_message = data.get('message', '')
+        code = data.get('code', '')
+        language = data.get('language', 'javascript')
+        history = data.get('history', [])
+        
+        logger.info("Streaming chat message: %.50s...", user_message)
+        
+        def generate():
+            for delta in ai_service.stream_response(
+                user_message=user_message,
+                conversation_history=history,
+                code_context=code,
+                language=language
+            ):
+                yield f"data: {json.dumps({'delta': delta})}\n\n"
+            yield "data: [DONE]\n\n"
+        
+        # no-cache keeps proxies from buffering the stream into one response
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache'}
+        )
+        
+    except Exception as e:
+        logger.error("Error streaming chat: %s", e)
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/upload', methods=['POST'])
@@ -156,14 +202,8 @@ def upload_file():
             return jsonify({"error": "No selected file"}), 400
             
         if file:
-            # Save the file temporarily
-            temp_path = os.path.join('temp', file.filename)
-            os.makedirs('temp', exist_ok=True)
-            file.save(temp_path)
-            
             # Read the file content
-            with open(temp_path, 'r', encoding='utf-8') as f:
-                code = f.read()
+            code = _read_upload(file)
             
             # Determine language from file extension
             _, ext = os.path.splitext(file.filename)
@@ -172,9 +212,6 @@ def upload_file():
             # Analyze the code
             analysis_result = code_analyzer.analyze(code, language, file.filename)
             
-            # Clean up
-            os.remove(temp_path)
-            
             return jsonify({
                 "filename": file.filename,
                 "language": language,
@@ -182,7 +219,7 @@ def upload_file():
             }), 200
             
     except Exception as e:
-        logger.error(f"Error processing upload: {str(e)}")
+        logger.error("Error processing upload: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/project', methods=['POST'])
@@ -205,15 +242,9 @@ def upload_project():
             if file.filename == '':
                 continue
                 
-            # Save the file temporarily
-            temp_path = os.path.join('temp', file.filename)
-            os.makedirs('temp', exist_ok=True)
-            file.save(temp_path)
-            
             # Read the file content
             try:
-                with open(temp_path, 'r', encoding='utf-8') as f:
-                    code = f.read()
+                code = _read_upload(file)
                 
                 # Determine language from file extension
                 _, ext = os.path.splitext(file.filename)
@@ -229,14 +260,11 @@ def upload_project():
                 })
                 
             except Exception as e:
-                logger.warning(f"Error processing file {file.filename}: {str(e)}")
+                logger.warning("Error processing file %s: %s", file.filename, e)
                 project_analysis.append({
                     "filename": file.filename,
                     "error": str(e)
                 })
-            
-            # Clean up
-            os.remove(temp_path)
         
         # Perform project-level analysis
         project_summary = code_analyzer.analyze_project(project_analysis)
@@ -247,7 +275,7 @@ def upload_project():
         }), 200
             
     except Exception as e:
-        logger.error(f"Error processing project upload: {str(e)}")
+        logger.error("Error processing project upload: %s", e)
         return jsonify({"error": str(e)}), 500
 
 if __name__ == '__main__':
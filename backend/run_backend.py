@@ -2,9 +2,19 @@
 AetherCode - Backend Server Runner
 """
 
+import os
+
 from app import app
 
 if __name__ == '__main__':
     print("Starting AetherCode backend server...")
     print("API available at http://localhost:5000/api")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # The reloader re-executes the whole app in a child process, doubling
+    # startup time; start_aethercode.py turns it off via FLASK_USE_RELOADER=0
+    app.run(
+        debug=True,
+        host='0.0.0.0',
+        port=5000,
+        threaded=True,
+        use_reloader=os.getenv('FLASK_USE_RELOADER', '1') != '0'
+    )
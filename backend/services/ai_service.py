@@ -5,10 +5,17 @@ This service handles interactions with AI models for code analysis and chat func
 """
 
 import os
+import re
 import logging
+import random
 import json
-from typing import List, Dict, Any, Optional
+import itertools
+import threading
+import time
+from contextlib import nullcontext
+from typing import List, Dict, Any, Optional, Iterator
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -16,6 +23,126 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Canned replies used in demo mode (no API key). Built once at import time
+# instead of on every call; entries are checked in order and the first
+# keyword hit wins. A response of None marks the review branch, which
+# depends on whether code context was supplied.
+_MOCK_RESPONSES = (
+    (("hello", "hi"), "Hello! I'm AetherCode AI. I can help you with code review, bug fixes, and programming questions. Note that I'm currently running in demo mode without an OpenAI API key."),
+    (("help",), "I can help you with code review, bug identification, optimization suggestions, and answering programming questions. Currently running in demo mode without an OpenAI API key."),
+    (("review", "analyze"), None),
+    (("error", "bug"), "I can help identify bugs in your code. In this demo mode (no API key), I can't provide detailed analysis. Please configure a valid OpenAI API key in the .env file for full functionality."),
+)
+_MOCK_REVIEW_RESPONSE = "I've analyzed your {language} code. This is a demo response as no valid OpenAI API key is configured. In a real implementation, I would provide detailed code review with suggestions for improvements."
+_MOCK_NO_CODE_RESPONSE = "Please provide some code for me to review. Note that I'm currently running in demo mode without an OpenAI API key."
+_MOCK_DEFAULT_RESPONSE = "I'm running in demo mode without an OpenAI API key. To enable full AI functionality, please add a valid OpenAI API key to the .env file in the backend directory. For now, I can only provide basic responses."
+
+# Keyword -> position in _MOCK_RESPONSES, plus one precompiled pattern that
+# finds every keyword occurrence (as a substring, overlaps included) in a
+# single scan of the message
+_MOCK_KEYWORD_INDEX = {
+    keyword: index
+    for index, (keywords, _) in enumerate(_MOCK_RESPONSES)
+    for keyword in keywords
+}
+_MOCK_KEYWORD_RE = re.compile("(?=(" + "|".join(map(re.escape, _MOCK_KEYWORD_INDEX)) + "))")
+
+# Example values from the docs and .env templates that mean no key is set
+_API_KEY_PLACEHOLDERS = frozenset({"your_openai_api_key_here", "your_api_key_here"})
+
+# Number of trailing conversation messages forwarded to the API with each chat
+_MAX_HISTORY_MESSAGES = 20
+
+# Prompt templates are static, so they are built once at import time rather
+# than re-created on every service construction or analysis request.
+_SYSTEM_PROMPT = """
+        You are AetherCode AI, an intelligent code assistant. Your purpose is to help users with:
+        1. Code review and analysis
+        2. Bug identification and fixes
+        3. Best practices and optimization suggestions
+        4. Answering programming questions
+        5. Explaining code concepts
+        
+        Be concise, helpful, and focus on providing practical advice. When analyzing code, consider:
+        - Code quality and readability
+        - Potential bugs or edge cases
+        - Performance optimizations
+        - Security considerations
+        - Best practices for the specific language
+        
+        If you're unsure about something, acknowledge it rather than making assumptions.
+        """
+
+_SECURITY_ANALYSIS_PROMPT = """
+            Analyze the following code for security vulnerabilities and risks.
+            Focus on:
+            1. Injection vulnerabilities
+            2. Authentication issues
+            3. Data exposure
+            4. Security misconfigurations
+            5. Using components with known vulnerabilities
+            6. Insecure cryptographic storage
+            
+            Format your response as JSON with these sections:
+            - vulnerabilities: List of identified security issues
+            - risk_level: Overall risk assessment (low, medium, high)
+            - recommendations: Specific fixes for each vulnerability
+            """
+
+_PERFORMANCE_ANALYSIS_PROMPT = """
+            Analyze the following code for performance optimizations.
+            Focus on:
+            1. Algorithmic efficiency
+            2. Resource usage
+            3. Memory management
+            4. Bottlenecks
+            5. Unnecessary operations
+            
+            Format your response as JSON with these sections:
+            - issues: List of performance issues
+            - impact: Impact assessment for each issue (low, medium, high)
+            - optimizations: Specific optimization suggestions
+            """
+
+_GENERAL_ANALYSIS_PROMPT = """
+            Analyze the following code for quality, readability, and best practices.
+            Focus on:
+            1. Code structure and organization
+            2. Naming conventions
+            3. Error handling
+            4. Documentation
+            5. Adherence to language best practices
+            6. Potential bugs or edge cases
+            
+            Format your response as JSON with these sections:
+            - issues: List of identified issues
+            - suggestions: Improvement recommendations
+            - positive_aspects: Good practices already present in the code
+            """
+
+# Analysis type -> prompt; unknown types get the general analysis
+_ANALYSIS_PROMPTS = {
+    "security": _SECURITY_ANALYSIS_PROMPT,
+    "performance": _PERFORMANCE_ANALYSIS_PROMPT,
+    "general": _GENERAL_ANALYSIS_PROMPT
+}
+
+# Completion token budget for every request
+_API_MAX_TOKENS = 2000
+
+# After a rate limit, server error or connection failure, further calls fail
+# fast for this many seconds instead of each waiting on the struggling API
+_API_ERROR_COOLDOWN = 30.0
+
+# (connect, read) timeouts in seconds for chat completion requests
+_API_TIMEOUT = (5, 60)
+
+# Server errors, dropped connections and rate limits that outlast the key
+# pool are retried with jittered exponential backoff, or after the server's
+# Retry-After delay (capped) when it sends one
+_API_RETRY_BASE_DELAY = 0.5
+_API_MAX_RETRY_AFTER = 10.0
+
 class AIService:
     """
     Service for AI-powered code analysis and chat functionality.
@@ -27,28 +154,48 @@ class AIService:
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.model = os.getenv("AI_MODEL", "gpt-4")
         
+        # Optional comma-separated pool of keys; requests are spread across
+        # them round-robin and fail over to the next key on rate limiting
+        self.api_keys = [key.strip() for key in os.getenv("OPENAI_API_KEYS", "").split(",") if key.strip()]
+        if not self.api_keys and self.api_key:
+            self.api_keys = [self.api_key]
+        if not self.api_key and self.api_keys:
+            self.api_key = self.api_keys[0]
+        self._key_counter = itertools.count()
+        self.max_retries = int(os.getenv("AI_MAX_RETRIES", "2"))
+        
+        # Request headers for each key, built once rather than per request
+        self._key_headers = [
+            {"Content-Type": "application/json", "Authorization": f"Bearer {key}"}
+            for key in self.api_keys
+        ]
+        
         # Check if API key is available
         if not self.api_key:
             logger.warning("No OpenAI API key found. Set OPENAI_API_KEY environment variable for AI functionality.")
         
+        # Resolve demo mode once instead of re-checking the key on every call
+        self.mock_mode = not self.api_key or self.api_key in _API_KEY_PLACEHOLDERS
+        
         # Initialize conversation context
-        self.system_prompt = """
-        You are AetherCode AI, an intelligent code assistant. Your purpose is to help users with:
-        1. Code review and analysis
-        2. Bug identification and fixes
-        3. Best practices and optimization suggestions
-        4. Answering programming questions
-        5. Explaining code concepts
+        self.system_prompt = _SYSTEM_PROMPT
         
-        Be concise, helpful, and focus on providing practical advice. When analyzing code, consider:
-        - Code quality and readability
-        - Potential bugs or edge cases
-        - Performance optimizations
-        - Security considerations
-        - Best practices for the specific language
+        # Limit on in-flight API requests; at least one, since a zero-slot
+        # semaphore would block every call forever
+        max_concurrent = max(1, int(os.getenv("AI_MAX_CONCURRENT_REQUESTS", "16")))
         
-        If you're unsure about something, acknowledge it rather than making assumptions.
-        """
+        # Shared session so API calls reuse keep-alive connections instead of
+        # paying a TCP and TLS handshake on every request
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrent))
+        
+        # Caps in-flight API requests, streamed chats included, across all
+        # threads so bursts queue here instead of opening extra connections
+        # and tripping rate limits
+        self._request_slots = threading.BoundedSemaphore(max_concurrent)
+        
+        # (monotonic deadline, error message) of the last transient API failure
+        self._api_failure = (0.0, None)
     
     def get_response(self, 
                     user_message: str, 
@@ -67,26 +214,12 @@ class AIService:
         Returns:
             AI response as a string
         """
-        if not self.api_key or self.api_key == "your_openai_api_key_here":
+        if self.mock_mode:
             logger.warning("No valid OpenAI API key found. Using mock response.")
             return self._get_mock_response(user_message, code_context, language)
         
         try:
-            # Prepare conversation history
-            messages = [{"role": "system", "content": self.system_prompt}]
-            
-            # Add conversation history if available
-            if conversation_history:
-                for msg in conversation_history:
-                    messages.append(msg)
-            
-            # Add code context if available
-            if code_context:
-                code_message = f"I'm working with this {language} code:\n```{language}\n{code_context}\n```"
-                messages.append({"role": "user", "content": code_message})
-            
-            # Add current user message
-            messages.append({"role": "user", "content": user_message})
+            messages = self._build_chat_messages(user_message, conversation_history, code_context, language)
             
             # Call OpenAI API
             response = self._call_openai_api(messages)
@@ -94,9 +227,72 @@ class AIService:
             return response
             
         except Exception as e:
-            logger.error(f"Error getting AI response: {str(e)}")
+            logger.error("Error getting AI response: %s", e)
             return f"Sorry, I encountered an error: {str(e)}"
     
+    def stream_response(self, 
+                       user_message: str, 
+                       conversation_history: List[Dict[str, str]] = None,
+                       code_context: str = None,
+                       language: str = "javascript") -> Iterator[str]:
+        """
+        Stream the AI response for a user message as it is generated
+        
+        Args:
+            user_message: The user's message
+            conversation_history: Previous messages in the conversation
+            code_context: Current code in the editor (optional)
+            language: Programming language of the code (optional)
+            
+        Yields:
+            Chunks of the AI response as they arrive
+        """
+        if self.mock_mode:
+            logger.warning("No valid OpenAI API key found. Using mock response.")
+            yield self._get_mock_response(user_message, code_context, language)
+            return
+        
+        try:
+            recent_failure = self._recent_api_failure()
+            if recent_failure:
+                yield recent_failure
+                return
+            
+            messages = self._build_chat_messages(user_message, conversation_history, code_context, language)
+            
+            # The body is read after the request returns, so hold a request
+            # slot until the stream is finished or the client goes away
+            with self._request_slots:
+                response = self._post_chat_completion(messages, stream=True)
+                
+                if response.status_code != 200:
+                    logger.error("API error: %s - %s", response.status_code, response.text)
+                    yield self._record_api_failure(response.status_code)
+                    return
+                
+                # Server-sent events: one JSON chunk per "data:" line
+                with response:
+                    for line in response.iter_lines(decode_unicode=True):
+                        if not line or not line.startswith("data: "):
+                            continue
+                            
+                        data = line[len("data: "):]
+                        if data == "[DONE]":
+                            break
+                            
+                        choices = json.loads(data).get("choices") or [{}]
+                        delta = choices[0].get("delta", {}).get("content")
+                        if delta:
+                            yield delta
+                        
+        except requests.RequestException as e:
+            logger.error("Error streaming AI response: %s", e)
+            self._record_api_failure()
+            yield f"Sorry, I encountered an error: {str(e)}"
+        except Exception as e:
+            logger.error("Error streaming AI response: %s", e)
+            yield f"Sorry, I encountered an error: {str(e)}"
+    
     def analyze_code(self, 
                     code: str, 
                     language: str = "javascript", 
@@ -112,7 +308,7 @@ class AIService:
         Returns:
             Dictionary with analysis results
         """
-        if not self.api_key or self.api_key == "your_openai_api_key_here":
+        if self.mock_mode:
             logger.warning("No valid OpenAI API key found. Using mock analysis response.")
             mock_response = self._get_mock_response(f"Please analyze this {language} code", code, language)
             return {
@@ -140,7 +336,7 @@ class AIService:
             return analysis_result
             
         except Exception as e:
-            logger.error(f"Error analyzing code with AI: {str(e)}")
+            logger.error("Error analyzing code with AI: %s", e)
             return {"error": str(e)}
     
     def _call_openai_api(self, messages: List[Dict[str, str]]) -> str:
@@ -154,35 +350,197 @@ class AIService:
             AI response as a string
         """
         try:
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
+            recent_failure = self._recent_api_failure()
+            if recent_failure:
+                return recent_failure
             
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.7,
-                "max_tokens": 2000
-            }
-            
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
+            response = self._post_chat_completion(messages)
             
             if response.status_code != 200:
-                logger.error(f"API error: {response.status_code} - {response.text}")
-                return f"API error: {response.status_code}"
+                logger.error("API error: %s - %s", response.status_code, response.text)
+                return self._record_api_failure(response.status_code)
                 
             result = response.json()
-            return result["choices"][0]["message"]["content"]
             
+            # The system prompt is a fixed module constant placed first, so
+            # repeated calls share a prefix the API can serve from its prompt
+            # cache; log the cached token count to make hits visible
+            usage = result.get("usage") or {}
+            cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+            logger.debug("Prompt tokens: %s (cached: %s)", usage.get("prompt_tokens", 0), cached_tokens)
+            
+            choice = result["choices"][0]
+            content = choice["message"]["content"]
+            
+            # A reply cut off at the token budget is incomplete
+            if choice.get("finish_reason") == "length":
+                logger.warning("API reply truncated at max_tokens=%d", _API_MAX_TOKENS)
+            
+            return content
+            
+        except requests.RequestException as e:
+            logger.error("Error calling OpenAI API: %s", e)
+            self._record_api_failure()
+            raise
         except Exception as e:
-            logger.error(f"Error calling OpenAI API: {str(e)}")
+            logger.error("Error calling OpenAI API: %s", e)
             raise
     
+    def _recent_api_failure(self) -> Optional[str]:
+        """
+        Return the error of a transient API failure that is still cooling down
+        
+        Returns:
+            The error message, or None if the API may be called
+        """
+        deadline, error = self._api_failure
+        if error and time.monotonic() < deadline:
+            logger.debug("Skipping API call during error cooldown")
+            return error
+        return None
+    
+    def _record_api_failure(self, status_code: Optional[int] = None) -> str:
+        """
+        Remember a failed API call so callers fail fast while it cools down
+        
+        Args:
+            status_code: HTTP status of the failed call, or None for a connection error
+            
+        Returns:
+            Error message for the failed call
+        """
+        error = f"API error: {status_code}" if status_code else "API error: service unavailable"
+        
+        # Only rate limits, server errors and connection failures are likely
+        # to repeat immediately; client errors are specific to the request
+        if status_code is None or status_code == 429 or status_code >= 500:
+            self._api_failure = (time.monotonic() + _API_ERROR_COOLDOWN, error)
+        
+        return error
+    
+    def _build_chat_messages(self, 
+                            user_message: str, 
+                            conversation_history: List[Dict[str, str]] = None,
+                            code_context: str = None,
+                            language: str = "javascript") -> List[Dict[str, str]]:
+        """
+        Build the message list sent to the chat completions API
+        
+        Args:
+            user_message: The user's message
+            conversation_history: Previous messages in the conversation
+            code_context: Current code in the editor (optional)
+            language: Programming language of the code (optional)
+            
+        Returns:
+            List of message dictionaries
+        """
+        # Prepare conversation history
+        messages = [{"role": "system", "content": self.system_prompt}]
+        
+        # Add code context right after the system prompt. It rarely changes
+        # between turns, so keeping it ahead of the growing history gives every
+        # request in a session the same prefix and lets the API's automatic
+        # prompt caching reuse it
+        if code_context:
+            code_message = f"I'm working with this {language} code:\n```{language}\n{code_context}\n```"
+            messages.append({"role": "user", "content": code_message})
+        
+        # Add the most recent conversation history if available; older turns
+        # are dropped so long chats don't grow the prompt without bound
+        if conversation_history:
+            messages.extend(conversation_history[-_MAX_HISTORY_MESSAGES:])
+        
+        # Add current user message
+        messages.append({"role": "user", "content": user_message})
+        
+        return messages
+    
+    def _post_chat_completion(self, messages: List[Dict[str, str]], stream: bool = False) -> requests.Response:
+        """
+        Send a chat completions request, rotating through the API key pool
+        
+        Streamed requests are sent without taking a request slot; the caller
+        must hold one until it has finished reading the body.
+        
+        Args:
+            messages: List of message dictionaries
+            stream: Whether to request a server-sent event stream
+            
+        Returns:
+            The HTTP response from the API
+        """
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": _API_MAX_TOKENS
+        }
+        if stream:
+            payload["stream"] = True
+        
+        # Start at the next key in the rotation and move on to the
+        # following one whenever a key is rate limited
+        start = next(self._key_counter)
+        key_count = len(self.api_keys)
+        attempt = 0
+        retries = 0
+        
+        # Non-streamed bodies are read before post() returns, so the slot only
+        # needs to be held for the request itself
+        request_slot = nullcontext() if stream else self._request_slots
+        
+        while True:
+            try:
+                with request_slot:
+                    response = self.session.post(
+                        "https://api.openai.com/v1/chat/completions",
+                        headers=self._key_headers[(start + attempt) % key_count],
+                        json=payload,
+                        stream=stream,
+                        timeout=_API_TIMEOUT
+                    )
+            except requests.ConnectionError as e:
+                if retries >= self.max_retries:
+                    raise
+                retries += 1
+                logger.warning("API connection failed (%s), retrying (%d/%d)", e, retries, self.max_retries)
+                self._retry_backoff(retries)
+                continue
+            
+            if response.status_code == 429 and attempt < key_count - 1:
+                attempt += 1
+                logger.warning("API key %d/%d rate limited, trying next key", attempt, key_count)
+                response.close()
+                continue
+            
+            if (response.status_code == 429 or response.status_code >= 500) and retries < self.max_retries:
+                retries += 1
+                logger.warning("API returned %s, retrying (%d/%d)", response.status_code, retries, self.max_retries)
+                retry_after = response.headers.get("Retry-After")
+                response.close()
+                self._retry_backoff(retries, retry_after)
+                continue
+            
+            return response
+    
+    def _retry_backoff(self, retry: int, retry_after: Optional[str] = None) -> None:
+        """
+        Sleep before a retry
+        
+        Uses the server's Retry-After delay when given, otherwise exponential
+        backoff with full jitter.
+        
+        Args:
+            retry: Number of the upcoming retry, starting at 1
+            retry_after: Value of the response's Retry-After header, if any
+        """
+        try:
+            delay = min(float(retry_after), _API_MAX_RETRY_AFTER)
+        except (TypeError, ValueError):
+            delay = random.uniform(0, _API_RETRY_BASE_DELAY * 2 ** retry)
+        time.sleep(delay)
+    
     def _create_analysis_prompt(self, analysis_type: str, language: str) -> str:
         """
         Create a prompt for code analysis based on analysis type
@@ -196,55 +554,7 @@ class AIService:
         """
         base_prompt = "You are an expert code reviewer specializing in " + language + "."
         
-        if analysis_type == "security":
-            return base_prompt + """
-            Analyze the following code for security vulnerabilities and risks.
-            Focus on:
-            1. Injection vulnerabilities
-            2. Authentication issues
-            3. Data exposure
-            4. Security misconfigurations
-            5. Using components with known vulnerabilities
-            6. Insecure cryptographic storage
-            
-            Format your response as JSON with these sections:
-            - vulnerabilities: List of identified security issues
-            - risk_level: Overall risk assessment (low, medium, high)
-            - recommendations: Specific fixes for each vulnerability
-            """
-            
-        elif analysis_type == "performance":
-            return base_prompt + """
-            Analyze the following code for performance optimizations.
-            Focus on:
-            1. Algorithmic efficiency
-            2. Resource usage
-            3. Memory management
-            4. Bottlenecks
-            5. Unnecessary operations
-            
-            Format your response as JSON with these sections:
-            - issues: List of performance issues
-            - impact: Impact assessment for each issue (low, medium, high)
-            - optimizations: Specific optimization suggestions
-            """
-            
-        else:  # general analysis
-            return base_prompt + """
-            Analyze the following code for quality, readability, and best practices.
-            Focus on:
-            1. Code structure and organization
-            2. Naming conventions
-            3. Error handling
-            4. Documentation
-            5. Adherence to language best practices
-            6. Potential bugs or edge cases
-            
-            Format your response as JSON with these sections:
-            - issues: List of identified issues
-            - suggestions: Improvement recommendations
-            - positive_aspects: Good practices already present in the code
-            """
+        return base_prompt + _ANALYSIS_PROMPTS.get(analysis_type, _GENERAL_ANALYSIS_PROMPT)
     
     def _parse_analysis_response(self, response: str) -> Dict[str, Any]:
         """
@@ -290,21 +600,17 @@ class AIService:
         Returns:
             Mock AI response as a string
         """
-        # Simple mock responses based on message content
-        if "hello" in user_message.lower() or "hi" in user_message.lower():
-            return "Hello! I'm AetherCode AI. I can help you with code review, bug fixes, and programming questions. Note that I'm currently running in demo mode without an OpenAI API key."
+        hits = [_MOCK_KEYWORD_INDEX[match.group(1)] for match in _MOCK_KEYWORD_RE.finditer(user_message.lower())]
         
-        if "help" in user_message.lower():
-            return "I can help you with code review, bug identification, optimization suggestions, and answering programming questions. Currently running in demo mode without an OpenAI API key."
-            
-        if "review" in user_message.lower() or "analyze" in user_message.lower():
-            if code_context:
-                return f"I've analyzed your {language} code. This is a demo response as no valid OpenAI API key is configured. In a real implementation, I would provide detailed code review with suggestions for improvements."
-            else:
-                return "Please provide some code for me to review. Note that I'm currently running in demo mode without an OpenAI API key."
-                
-        if "error" in user_message.lower() or "bug" in user_message.lower():
-            return "I can help identify bugs in your code. In this demo mode (no API key), I can't provide detailed analysis. Please configure a valid OpenAI API key in the .env file for full functionality."
-            
         # Default response
-        return "I'm running in demo mode without an OpenAI API key. To enable full AI functionality, please add a valid OpenAI API key to the .env file in the backend directory. For now, I can only provide basic responses."
+        if not hits:
+            return _MOCK_DEFAULT_RESPONSE
+        
+        # Earlier table entries take priority
+        response = _MOCK_RESPONSES[min(hits)][1]
+        if response is None:
+            # Review requests depend on whether code was supplied
+            if code_context:
+                return _MOCK_REVIEW_RESPONSE.format(language=language)
+            return _MOCK_NO_CODE_RESPONSE
+        return response
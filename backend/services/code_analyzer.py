@@ -6,10 +6,93 @@ This service analyzes code and provides feedback, suggestions, and insights.
 
 import re
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Patterns used by the language analyzers, compiled once at import time.
+# They are kept as separate literal-prefixed patterns rather than one
+# alternation because CPython's re scans those noticeably faster.
+_JS_CONSOLE_LOG_RE = re.compile(r'console\.log\s*\(')
+_JS_VAR_RE = re.compile(r'\bvar\s+')
+_JS_ADD_LISTENER_RE = re.compile(r'addEventListener\s*\(')
+_JS_REMOVE_LISTENER_RE = re.compile(r'removeEventListener\s*\(')
+_JS_TRY_RE = re.compile(r'\btry\s*{')
+_PY_PRINT_RE = re.compile(r'\bprint\s*\(')
+_PY_TRY_RE = re.compile(r'\btry\s*:')
+_PY_EXCEPT_RE = re.compile(r'\bexcept\s*')
+
+# Single-line comment markers recognised by _calculate_metrics
+_LINE_COMMENT_PREFIXES = ('//', '#', '--')
+
+# File extension to language mapping used by detect_language
+_LANGUAGE_EXTENSIONS = {
+    # JavaScript and TypeScript
+    'js': 'javascript',
+    'jsx': 'javascript',
+    'ts': 'typescript',
+    'tsx': 'typescript',
+    
+    # Python
+    'py': 'python',
+    'pyc': 'python',
+    'pyd': 'python',
+    'pyo': 'python',
+    'pyw': 'python',
+    
+    # Java
+    'java': 'java',
+    
+    # C#
+    'cs': 'csharp',
+    
+    # C++
+    'cpp': 'cpp',
+    'cc': 'cpp',
+    'cxx': 'cpp',
+    'c': 'cpp',
+    'h': 'cpp',
+    'hpp': 'cpp',
+    
+    # PHP
+    'php': 'php',
+    
+    # Ruby
+    'rb': 'ruby',
+    
+    # Go
+    'go': 'go',
+    
+    # Swift
+    'swift': 'swift',
+    
+    # Kotlin
+    'kt': 'kotlin',
+    'kts': 'kotlin',
+    
+    # Rust
+    'rs': 'rust',
+    
+    # HTML
+    'html': 'html',
+    'htm': 'html',
+    
+    # CSS
+    'css': 'css',
+    
+    # SQL
+    'sql': 'sql'
+}
+
+# Feedback returned for languages without dedicated analysis rules
+_GENERIC_SUGGESTIONS = (
+    "Consider adding more comments to explain complex logic",
+    "Ensure consistent formatting throughout the code"
+)
+_GENERIC_INSIGHTS = (
+    "This language doesn't have specific analysis rules implemented yet",
+)
+
 class CodeAnalyzer:
     """
     Analyzes code for quality, patterns, and potential issues.
@@ -17,85 +100,16 @@ class CodeAnalyzer:
     
     def __init__(self):
         """Initialize the code analyzer with language-specific rules"""
-        self.language_extensions = {
-            # JavaScript and TypeScript
-            'js': 'javascript',
-            'jsx': 'javascript',
-            'ts': 'typescript',
-            'tsx': 'typescript',
-            
-            # Python
-            'py': 'python',
-            'pyc': 'python',
-            'pyd': 'python',
-            'pyo': 'python',
-            'pyw': 'python',
-            
-            # Java
-            'java': 'java',
-            
-            # C#
-            'cs': 'csharp',
-            
-            # C++
-            'cpp': 'cpp',
-            'cc': 'cpp',
-            'cxx': 'cpp',
-            'c': 'cpp',
-            'h': 'cpp',
-            'hpp': 'cpp',
-            
-            # PHP
-            'php': 'php',
-            
-            # Ruby
-            'rb': 'ruby',
-            
-            # Go
-            'go': 'go',
-            
-            # Swift
-            'swift': 'swift',
-            
-            # Kotlin
-            'kt': 'kotlin',
-            'kts': 'kotlin',
-            
-            # Rust
-            'rs': 'rust',
-            
-            # HTML
-            'html': 'html',
-            'htm': 'html',
-            
-            # CSS
-            'css': 'css',
-            
-            # SQL
-            'sql': 'sql'
-        }
-        
         # Initialize language-specific analyzers
         self._init_analyzers()
         
     def _init_analyzers(self):
         """Initialize language-specific analyzers"""
+        # Languages without dedicated rules fall back to _analyze_generic
         self.analyzers = {
             'javascript': self._analyze_javascript,
             'typescript': self._analyze_javascript,  # Reuse JS analyzer for now
-            'python': self._analyze_python,
-            'java': self._analyze_java,
-            'csharp': self._analyze_csharp,
-            'cpp': self._analyze_cpp,
-            'php': self._analyze_php,
-            'ruby': self._analyze_ruby,
-            'go': self._analyze_go,
-            'swift': self._analyze_swift,
-            'kotlin': self._analyze_kotlin,
-            'rust': self._analyze_rust,
-            'html': self._analyze_html,
-            'css': self._analyze_css,
-            'sql': self._analyze_sql
+            'python': self._analyze_python
         }
         
     def detect_language(self, extension: str) -> str:
@@ -108,7 +122,7 @@ class CodeAnalyzer:
         Returns:
             Detected language or 'javascript' as default
         """
-        return self.language_extensions.get(extension, 'javascript')
+        return _LANGUAGE_EXTENSIONS.get(extension, 'javascript')
         
     def analyze(self, code: str, language: str, filename: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -122,7 +136,7 @@ class CodeAnalyzer:
         Returns:
             Dictionary with analysis results
         """
-        logger.info(f"Analyzing {language} code")
+        logger.info("Analyzing %s code", language)
         
         # Basic code metrics
         metrics = self._calculate_metrics(code)
@@ -219,16 +233,22 @@ class CodeAnalyzer:
         lines = code.split('\n')
         total_lines = len(lines)
         
-        # Count empty lines
-        empty_lines = sum(1 for line in lines if line.strip() == '')
-        
-        # Approximate comment lines (this is a simple heuristic)
+        # Count empty and comment lines in a single pass
+        # (comment detection is a simple heuristic)
+        empty_lines = 0
         comment_lines = 0
         in_multiline_comment = False
         
         for line in lines:
             stripped = line.strip()
             
+            if not stripped:
+                empty_lines += 1
+                # Blank lines inside a block comment still count as comments
+                if in_multiline_comment:
+                    comment_lines += 1
+                continue
+            
             # Check for multiline comments
             if '/*' in stripped and '*/' in stripped:
                 comment_lines += 1
@@ -249,7 +269,7 @@ class CodeAnalyzer:
                 continue
                 
             # Check for single-line comments
-            if stripped.startswith('//') or stripped.startswith('#') or stripped.startswith('--'):
+            if stripped.startswith(_LINE_COMMENT_PREFIXES):
                 comment_lines += 1
         
         # Calculate code lines
@@ -275,13 +295,8 @@ class CodeAnalyzer:
         """
         return {
             "issues": [],
-            "suggestions": [
-                "Consider adding more comments to explain complex logic",
-                "Ensure consistent formatting throughout the code"
-            ],
-            "insights": [
-                "This language doesn't have specific analysis rules implemented yet"
-            ]
+            "suggestions": list(_GENERIC_SUGGESTIONS),
+            "insights": list(_GENERIC_INSIGHTS)
         }
     
     def _analyze_javascript(self, code: str) -> Dict[str, Any]:
@@ -299,7 +314,7 @@ class CodeAnalyzer:
         insights = []
         
         # Check for console.log statements
-        console_logs = len(re.findall(r'console\.log\s*\(', code))
+        console_logs = len(_JS_CONSOLE_LOG_RE.findall(code))
         if console_logs > 0:
             issues.append({
                 "type": "debugging_code",
@@ -308,13 +323,13 @@ class CodeAnalyzer:
             })
         
         # Check for var usage (prefer let/const)
-        var_usage = len(re.findall(r'\bvar\s+', code))
-        if var_usage > 0:
+        # Only presence matters here, so stop at the first match
+        if _JS_VAR_RE.search(code):
             suggestions.append("Consider using 'let' and 'const' instead of 'var' for better scoping")
         
         # Check for potential memory leaks in event listeners
-        event_listeners = len(re.findall(r'addEventListener\s*\(', code))
-        remove_listeners = len(re.findall(r'removeEventListener\s*\(', code))
+        event_listeners = len(_JS_ADD_LISTENER_RE.findall(code))
+        remove_listeners = len(_JS_REMOVE_LISTENER_RE.findall(code))
         if event_listeners > remove_listeners:
             issues.append({
                 "type": "potential_memory_leak",
@@ -323,8 +338,7 @@ class CodeAnalyzer:
             })
         
         # Check for error handling
-        try_blocks = len(re.findall(r'\btry\s*{', code))
-        if try_blocks == 0 and len(code) > 500:
+        if len(code) > 500 and not _JS_TRY_RE.search(code):
             suggestions.append("Consider adding error handling with try/catch blocks for robust code")
         
         # Check for modern JS features
@@ -370,7 +384,7 @@ class CodeAnalyzer:
         insights = []
         
         # Check for print statements (should use logging in production)
-        print_statements = len(re.findall(r'\bprint\s*\(', code))
+        print_statements = len(_PY_PRINT_RE.findall(code))
         if print_statements > 0:
             issues.append({
                 "type": "debugging_code",
@@ -379,8 +393,8 @@ class CodeAnalyzer:
             })
         
         # Check for exception handling
-        try_blocks = len(re.findall(r'\btry\s*:', code))
-        except_blocks = len(re.findall(r'\bexcept\s*', code))
+        try_blocks = len(_PY_TRY_RE.findall(code))
+        except_blocks = len(_PY_EXCEPT_RE.findall(code))
         if try_blocks > 0 and try_blocks == except_blocks and 'Exception:' in code:
             issues.append({
                 "type": "broad_exception",
@@ -406,7 +420,9 @@ class CodeAnalyzer:
         if 'async def' in code:
             insights.append("Code uses async/await pattern for asynchronous operations")
         
-        if any(('f"' in line or "f'" in line) for line in lines):
+        # The prefixes never span a newline, so scan the source directly
+        # rather than walking the split lines a second time
+        if 'f"' in code or "f'" in code:
             insights.append("Code uses f-strings, a modern Python 3.6+ feature")
         
         # Check for potential security issues
@@ -422,63 +438,3 @@ class CodeAnalyzer:
             "suggestions": suggestions,
             "insights": insights
         }
-    
-    def _analyze_java(self, code: str) -> Dict[str, Any]:
-        """Analyze Java code"""
-        # Basic implementation for now
-        return self._analyze_generic(code)
-    
-    def _analyze_csharp(self, code: str) -> Dict[str, Any]:
-        """Analyze C# code"""
-        # Basic implementation for now
-        return self._analyze_generic(code)
-    
-    def _analyze_cpp(self, code: str) -> Dict[str, Any]:
-        """Analyze C++ code"""
-        # Basic implementation for now
-        return self._analyze_generic(code)
-    
-    def _analyze_php(self, code: str) -> Dict[str, Any]:
-        """Analyze PHP code"""
-        # Basic implementation for now
-        return self._analyze_generic(code)
-    
-    def _analyze_ruby(self, code: str) -> Dict[str, Any]:
-        """Analyze Ruby code"""
-        # Basic implementation for now
-        return self._analyze_generic(code)
-    
-    def _analyze_go(self, code: str) -> Dict[str, Any]:
-        """Analyze Go code"""
-        # Basic implementation for now
-        return self._analyze_generic(code)
-    
-    def _analyze_swift(self, code: str) -> Dict[str, Any]:
-        """Analyze Swift code"""
-        # Basic implementation for now
-        return self._analyze_generic(code)
-    
-    def _analyze_kotlin(self, code: str) -> Dict[str, Any]:
-        """Analyze Kotlin code"""
-        # Basic implementation for now
-        return self._analyze_generic(code)
-    
-    def _analyze_rust(self, code: str) -> Dict[str, Any]:
-        """Analyze Rust code"""
-        # Basic implementation for now
-        return self._analyze_generic(code)
-    
-    def _analyze_html(self, code: str) -> Dict[str, Any]:
-        """Analyze HTML code"""
-        # Basic implementation for now
-        return self._analyze_generic(code)
-    
-    def _analyze_css(self, code: str) -> Dict[str, Any]:
-        """Analyze CSS code"""
-        # Basic implementation for now
-        return self._analyze_generic(code)
-    
-    def _analyze_sql(self, code: str) -> Dict[str, Any]:
-        """Analyze SQL code"""
-        # Basic implementation for now
-        return self._analyze_generic(code)
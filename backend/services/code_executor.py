@@ -5,15 +5,17 @@ This service executes code in various programming languages and returns the outp
 """
 
 import os
+import re
 import subprocess
-import tempfile
 import logging
 import time
-import json
-from typing import Dict, Any, Tuple
+from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Matches the public class name that javac requires the file to be named after
+_JAVA_PUBLIC_CLASS_RE = re.compile(r'public\s+class\s+(\w+)')
+
 class CodeExecutor:
     """
     Executes code in various programming languages and returns the output.
@@ -90,8 +92,9 @@ class CodeExecutor:
             }
         }
         
-        # Create temp directory for code execution
-        os.makedirs('temp_execution', exist_ok=True)
+        # Temp directory is created lazily on the first execution so that
+        # constructing the service has no filesystem side effects
+        self._temp_dir_ready = False
     
     def execute(self, code: str, language: str) -> Dict[str, Any]:
         """
@@ -125,6 +128,8 @@ class CodeExecutor:
         extension = config['extension']
         
         try:
+            self._ensure_temp_dir()
+            
             # Create a unique filename
             timestamp = int(time.time())
             filename = f"temp_execution/code_{timestamp}.{extension}"
@@ -158,7 +163,7 @@ class CodeExecutor:
             }
             
         except Exception as e:
-            logger.error(f"Error executing {language} code: {str(e)}")
+            logger.error("Error executing %s code: %s", language, e)
             return {
                 "success": False,
                 "output": "",
@@ -166,6 +171,12 @@ class CodeExecutor:
                 "execution_time": 0
             }
     
+    def _ensure_temp_dir(self) -> None:
+        """Create the temp execution directory on first use"""
+        if not self._temp_dir_ready:
+            os.makedirs('temp_execution', exist_ok=True)
+            self._temp_dir_ready = True
+    
     def _run_command(self, command: str, filename: str, timeout: int) -> Dict[str, Any]:
         """
         Run a command with timeout
@@ -205,7 +216,7 @@ class CodeExecutor:
                 }
                 
         except Exception as e:
-            logger.error(f"Error running command: {str(e)}")
+            logger.error("Error running command: %s", e)
             return {
                 "success": False,
                 "output": "",
@@ -223,16 +234,18 @@ class CodeExecutor:
             if os.path.exists(filename):
                 os.remove(filename)
                 
-            # Remove any additional files created during compilation
-            base_name = os.path.splitext(filename)[0]
-            directory = os.path.dirname(filename)
-            
-            for file in os.listdir(directory):
-                if file.startswith(os.path.basename(base_name)) and file != os.path.basename(filename):
-                    os.remove(os.path.join(directory, file))
+            # Remove any additional files created during compilation. scandir
+            # returns the entry type with the listing, so directories are
+            # skipped without an extra stat call per entry
+            prefix = os.path.basename(os.path.splitext(filename)[0])
+            
+            with os.scandir(os.path.dirname(filename)) as entries:
+                for entry in entries:
+                    if entry.name.startswith(prefix) and entry.is_file():
+                        os.remove(entry.path)
                     
         except Exception as e:
-            logger.warning(f"Error cleaning up files: {str(e)}")
+            logger.warning("Error cleaning up files: %s", e)
     
     def _setup_java(self, filename: str) -> Dict[str, Any]:
         """
@@ -250,8 +263,7 @@ class CodeExecutor:
                 content = f.read()
             
             # Simple regex to find public class name
-            import re
-            match = re.search(r'public\s+class\s+(\w+)', content)
+            match = _JAVA_PUBLIC_CLASS_RE.search(content)
             
             if not match:
                 return {
@@ -291,7 +303,7 @@ class CodeExecutor:
             }
             
         except Exception as e:
-            logger.error(f"Error setting up Java execution: {str(e)}")
+            logger.error("Error setting up Java execution: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -338,7 +350,7 @@ class CodeExecutor:
             }
             
         except Exception as e:
-            logger.error(f"Error setting up C++ execution: {str(e)}")
+            logger.error("Error setting up C++ execution: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -394,7 +406,7 @@ class CodeExecutor:
             }
             
         except Exception as e:
-            logger.error(f"Error setting up C# execution: {str(e)}")
+            logger.error("Error setting up C# execution: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -456,7 +468,7 @@ class CodeExecutor:
             }
             
         except Exception as e:
-            logger.error(f"Error setting up TypeScript execution: {str(e)}")
+            logger.error("Error setting up TypeScript execution: %s", e)
             return {
                 "success": False,
                 "error": str(e)
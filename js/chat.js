@@ -82,12 +82,15 @@ function initChat() {
         // Simulate typing
         isAiTyping = true;
         let i = 0;
-        const typingSpeed = 15; // ms per character
+        const typingSpeed = 15; // ms per step
+        const maxSteps = 100; // cap the animation at roughly 1.5 seconds
+        const charsPerStep = Math.max(1, Math.ceil(message.length / maxSteps));
         
         function typeNextChar() {
             if (i < message.length) {
-                messageContent.innerHTML += escapeHtml(message.charAt(i));
-                i++;
+                // textContent appends without re-parsing the whole message
+                messageContent.textContent += message.slice(i, i + charsPerStep);
+                i += charsPerStep;
                 chatMessages.scrollTop = chatMessages.scrollHeight;
                 setTimeout(typeNextChar, typingSpeed);
             } else {
@@ -115,8 +118,8 @@ function initChat() {
             const code = window.editor ? window.editor.getValue() : '';
             const language = document.getElementById('language-select').value;
             
-            // Make API call to backend
-            const response = await fetch(`${window.API_BASE_URL}/chat`, {
+            // Stream the reply so it renders as soon as the first tokens arrive
+            const response = await fetch(`${window.API_BASE_URL}/chat/stream`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -132,9 +135,8 @@ function initChat() {
             // Remove typing indicator
             chatMessages.removeChild(loadingElement);
             
-            if (response.ok) {
-                const data = await response.json();
-                addAiMessage(data.response || 'I\'m having trouble processing your request.');
+            if (response.ok && response.body) {
+                await renderStreamedReply(response);
             } else {
                 // If backend is not available, provide a fallback response
                 addAiMessage('I\'m currently unable to connect to the backend. Please make sure the server is running.');
@@ -152,6 +154,65 @@ function initChat() {
         }
     }
     
+    // Render the server-sent events from /chat/stream as they arrive
+    async function renderStreamedReply(response) {
+        const messageElement = document.createElement('div');
+        messageElement.className = 'message ai-message';
+        const messageContent = document.createElement('p');
+        messageElement.appendChild(messageContent);
+        chatMessages.appendChild(messageElement);
+        
+        isAiTyping = true;
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let reply = '';
+        let fallback = 'I\'m having trouble processing your request.';
+        
+        try {
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                
+                // Events end with a blank line; keep a partial event for the next read
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                
+                for (const event of events) {
+                    const data = event.replace(/^data: /, '');
+                    if (data === '[DONE]') continue;
+                    
+                    let delta;
+                    try {
+                        delta = JSON.parse(data).delta || '';
+                    } catch (error) {
+                        // Skip a malformed event rather than abandoning the reply
+                        console.warn('Skipping malformed chat stream event:', data);
+                        continue;
+                    }
+                    reply += delta;
+                    messageContent.textContent += delta;
+                }
+                chatMessages.scrollTop = chatMessages.scrollHeight;
+            }
+        } catch (error) {
+            // The stream broke off; keep whatever part of the reply arrived
+            console.error('Error reading AI response stream:', error);
+            fallback = 'Sorry, I encountered an error. Please make sure the backend server is running.';
+        } finally {
+            isAiTyping = false;
+        }
+        
+        // Finish the bubble and add it to chat history
+        if (!reply) {
+            reply = fallback;
+            messageContent.textContent = reply;
+        }
+        chatHistory.push({ role: 'assistant', content: reply });
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+    }
+    
     // Helper function to escape HTML
     function escapeHtml(unsafe) {
         return unsafe
@@ -190,7 +190,9 @@ window.addAIMessage = function(text) {
 // Expose to window object so it can be used from editor.js
 window.animateTyping = function(element, text) {
     let index = 0;
-    const typingSpeed = 30; // milliseconds per character
+    const typingSpeed = 30; // milliseconds per step
+    const maxSteps = 60; // cap the animation at roughly two seconds
+    const charsPerStep = Math.max(1, Math.ceil(text.length / maxSteps));
     
     // Clear any existing content
     element.textContent = '';
@@ -208,13 +210,14 @@ window.animateTyping = function(element, text) {
                 element.removeChild(typingIndicator);
             }
             
-            // Add the next character
-            element.textContent += text[index];
+            // Add the next characters; long replies type several per step
+            // so they don't take seconds to finish rendering
+            element.textContent += text.slice(index, index + charsPerStep);
             
             // Re-add typing indicator
             element.appendChild(typingIndicator);
             
-            index++;
+            index += charsPerStep;
             
             // Random slight variation in typing speed for realism
             const randomDelay = typingSpeed + Math.random() * 20 - 10;
@@ -3,75 +3,113 @@ AetherCode - Startup Script
 This script starts both the frontend and backend servers
 """
 
+import atexit
 import os
+import socket
 import subprocess
 import sys
 import threading
 import time
+import urllib.request
 import webbrowser
 
-def start_backend():
-    """Start the Flask backend server"""
-    print("Starting backend server...")
-    backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
-    
-    # Check if we're on Windows or Unix
-    if sys.platform.startswith('win'):
-        process = subprocess.Popen(["python", "run_backend.py"], cwd=backend_dir)
-    else:
-        process = subprocess.Popen(["python3", "run_backend.py"], cwd=backend_dir)
-    
-    return process
+# Environment for the server processes: no Flask reloader (it re-imports the
+# whole app in a second process) and unbuffered output so logs show up live
+SERVER_ENV = dict(os.environ, FLASK_USE_RELOADER="0", PYTHONUNBUFFERED="1")
 
-def start_frontend():
-    """Start the frontend server using Python's http.server"""
-    print("Starting frontend server...")
-    frontend_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Check if we're on Windows or Unix
-    if sys.platform.startswith('win'):
-        process = subprocess.Popen(["python", "-m", "http.server", "8000"], cwd=frontend_dir)
-    else:
-        process = subprocess.Popen(["python3", "-m", "http.server", "8000"], cwd=frontend_dir)
-    
-    return process
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (name, command, working directory) of each server. Commands use the
+# interpreter running this script rather than whatever "python" resolves to
+SERVERS = (
+    ("backend", [sys.executable, "run_backend.py"], os.path.join(ROOT_DIR, "backend")),
+    ("frontend", [sys.executable, "-m", "http.server", "8000"], ROOT_DIR),
+)
+
+# How long to wait for each server to come up, and how often to check
+STARTUP_TIMEOUT = 15.0
+POLL_INTERVAL = 0.1
+
+def start_server(name, command, cwd):
+    """Start one server process with the shared server environment"""
+    print(f"Starting {name} server...")
+    return subprocess.Popen(command, cwd=cwd, env=SERVER_ENV)
+
+def wait_for_backend(url="http://127.0.0.1:5000/health", timeout=STARTUP_TIMEOUT):
+    """Poll the backend health endpoint until it answers or the timeout expires"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=0.5) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            pass
+        time.sleep(POLL_INTERVAL)
+    return False
+
+def wait_for_frontend(port=8000, timeout=STARTUP_TIMEOUT):
+    """Poll the frontend port until it accepts connections or the timeout expires"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(POLL_INTERVAL)
+    return False
+
+def watch_server(process, exited):
+    """Wait for a server process to exit, then signal the launcher"""
+    process.wait()
+    exited.set()
 
 def main():
     """Main function to start both servers"""
     print("Starting AetherCode application...")
     
-    # Start backend server in a separate process
-    backend_process = start_backend()
+    # Start all servers right away so their startup overlaps
+    processes = [start_server(name, command, cwd) for name, command, cwd in SERVERS]
     
-    # Wait for backend to initialize
-    print("Waiting for backend server to initialize...")
-    time.sleep(2)
+    # Make sure the servers are stopped even if we exit early, e.g. on
+    # Ctrl+C while still waiting for them to start
+    for process in processes:
+        atexit.register(process.terminate)
     
-    # Start frontend server in a separate process
-    frontend_process = start_frontend()
-    
-    # Wait for frontend to initialize
-    print("Waiting for frontend server to initialize...")
-    time.sleep(1)
+    # Wait until both are ready; the total wait is the slower of the two
+    print("Waiting for servers to initialize...")
+    if not wait_for_backend():
+        print("Backend did not respond in time; continuing anyway")
+    if not wait_for_frontend():
+        print("Frontend did not respond in time; continuing anyway")
     
     # Open the application in the default web browser
     print("Opening AetherCode in your web browser...")
-    webbrowser.open("http://localhost:8000")
+    # Launching the browser can block for a while on some platforms, so do
+    # it in the background and get straight to supervising the servers
+    threading.Thread(target=webbrowser.open, args=("http://localhost:8000",), daemon=True).start()
     
     print("\nAetherCode is now running!")
     print("Frontend: http://localhost:8000")
     print("Backend API: http://localhost:5000/api")
     print("\nPress Ctrl+C to stop the servers")
     
+    # Block until a server exits instead of waking up every second. Each
+    # server gets a thread that waits on its own process, so other children
+    # (such as the browser launcher) exiting don't end the session
+    server_exited = threading.Event()
+    for process in processes:
+        threading.Thread(target=watch_server, args=(process, server_exited), daemon=True).start()
+    
     try:
-        # Keep the script running until interrupted
-        while True:
-            time.sleep(1)
+        server_exited.wait()
+        print("\nA server stopped unexpectedly. Shutting down AetherCode...")
     except KeyboardInterrupt:
         print("\nShutting down AetherCode...")
-        backend_process.terminate()
-        frontend_process.terminate()
-        print("Servers stopped. Goodbye!")
+    
+    for process in processes:
+        process.terminate()
+    print("Servers stopped. Goodbye!")
 
 if __name__ == "__main__":
     main()